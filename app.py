@@ -2,31 +2,122 @@
 Venlo Weer App - Streamlit weerapplicatie voor Venlo met Open-Meteo API
 """
 
-import math
 import streamlit as st
+import streamlit.components.v1 as components
+import orjson
 import requests
-import folium
-from streamlit_folium import st_folium
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-import altair as alt
+import time
+from collections.abc import Callable
 from datetime import datetime
 
 # Venlo coördinaten (exact: stadhuis)
 VENLO_LAT = 51.3700
 VENLO_LON = 6.1681
 
+# Open-Meteo forecast endpoint en vooraf gecodeerde querystrings per onderdeel
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+CURRENT_QUERY = (
+    "current=temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m,weather_code"
+    "&timezone=Europe/Amsterdam"
+)
+HOURLY_QUERY = (
+    "hourly=temperature_2m,precipitation_probability,wind_speed_10m,wind_direction_10m"
+    "&timezone=Europe/Amsterdam"
+    "&forecast_days=2"  # 48 uur
+)
+DAILY_QUERY = (
+    "daily=temperature_2m_max,temperature_2m_min,precipitation_sum,wind_speed_10m_max,wind_direction_10m_dominant"
+    "&timezone=Europe/Amsterdam"
+    "&forecast_days=7"
+)
+
+# WMO weer codes -> emoji
+_WMO_EMOJI: dict[int, str] = {
+    0: "☀️", 1: "🌤️", 2: "⛅", 3: "☁️", 45: "🌫️", 48: "🌫️",
+    51: "🌧️", 53: "🌧️", 55: "🌧️", 61: "🌧️", 63: "🌧️", 65: "🌧️",
+    66: "🌨️", 67: "🌨️", 71: "❄️", 73: "❄️", 75: "❄️",
+    77: "❄️", 80: "🌦️", 81: "🌦️", 82: "🌦️", 85: "🌨️", 86: "🌨️",
+    95: "⛈️", 96: "⛈️", 99: "⛈️"
+}
+
+# Windrichtingen per 22,5° (kompasroos)
+_DIRECTIONS = np.array(["N", "NNO", "NO", "ONO", "O", "OZO", "ZO", "ZZO", "Z", "ZZW", "ZW", "WZW", "W", "WNW", "NW", "NNW"])
+
+# Eenheidscirkel per 22,5° voor de windpijl op de kaart (North = 0)
+_ARROW_RAD = np.radians(270 - np.arange(0, 360, 22.5))
+_COS16 = np.cos(_ARROW_RAD)
+_SIN16 = np.sin(_ARROW_RAD)
+
 # Buienradar radar-afbeelding (hele NL/BE)
 RADAR_URL = "https://api.buienradar.nl/image/1.0/RadarMapNL?width=550&height=512"
 
-st.set_page_config(
-    page_title="Venlo Weer",
-    page_icon="🌤️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# HTTP: (connect, read) timeout en hoe lang een onbereikbare bron wordt overgeslagen
+HTTP_TIMEOUT = (3.05, 10)
+OUTAGE_TTL = 60  # seconden
+
+# Vega-Lite specificaties voor de grafieken (oranje thema)
+ORANGE = "#ff8c00"
+_TEMP_COLOR = {"field": "Type", "type": "nominal", "scale": {"range": [ORANGE, "#ffa500"]}}
+
+_FORECAST_TEMP_SPEC = {
+    "height": 300,
+    "mark": {"type": "line", "point": True, "strokeWidth": 3},
+    "transform": [{"fold": ["Max (°C)", "Min (°C)"], "as": ["Type", "°C"]}],
+    "encoding": {
+        "x": {"field": "Dag", "type": "nominal", "title": "Dag", "sort": None},
+        "y": {"field": "°C", "type": "quantitative", "title": "Temperatuur (°C)"},
+        "color": _TEMP_COLOR,
+    },
+}
+_FORECAST_PRECIP_SPEC = {
+    "height": 200,
+    "mark": {"type": "bar", "color": ORANGE},
+    "encoding": {
+        "x": {"field": "Dag", "type": "nominal", "title": "Dag", "sort": None},
+        "y": {"field": "Neerslag (mm)", "type": "quantitative", "title": "Neerslag (mm)"},
+    },
+}
+_HOURLY_TEMP_SPEC = {
+    "height": 180,
+    "mark": {"type": "line", "color": ORANGE},
+    "encoding": {
+        "x": {"field": "Tijd", "type": "nominal", "title": "Tijd"},
+        "y": {"field": "Temp (°C)", "type": "quantitative", "title": "Temperatuur (°C)"},
+    },
+}
+_HOURLY_WIND_SPEC = {
+    "height": 180,
+    "mark": {"type": "line", "color": ORANGE},
+    "encoding": {
+        "x": {"field": "Tijd", "type": "nominal", "title": "Tijd"},
+        "y": {"field": "Wind (km/h)", "type": "quantitative", "title": "Windsnelheid (km/h)"},
+    },
+}
+_DAILY_TEMP_SPEC = {
+    "height": 250,
+    "mark": {"type": "bar"},
+    "transform": [{"fold": ["Max (°C)", "Min (°C)"], "as": ["Type", "°C"]}],
+    "encoding": {
+        "x": {"field": "Datum", "type": "nominal", "title": "Datum"},
+        "y": {"field": "°C", "type": "quantitative", "title": "Temperatuur (°C)", "stack": None},
+        "color": _TEMP_COLOR,
+    },
+}
+_DAILY_WIND_SPEC = {
+    "height": 250,
+    "mark": {"type": "bar", "color": ORANGE},
+    "encoding": {
+        "x": {"field": "Datum", "type": "nominal", "title": "Datum"},
+        "y": {"field": "Max wind (km/h)", "type": "quantitative", "title": "Max wind (km/h)"},
+    },
+}
 
 # Custom CSS voor betere styling
-st.markdown("""
+_CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -62,79 +153,241 @@ st.markdown("""
         box-shadow: 0 4px 6px rgba(0,0,0,0.1);
     }
 </style>
-""", unsafe_allow_html=True)
-
-
-@st.cache_data(ttl=600)  # Cache 10 minuten
-def fetch_weather_data(lat: float, lon: float) -> dict | None:
-    """Haal weerdata op van de Open-Meteo API."""
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": "temperature_2m,relative_humidity_2m,precipitation_probability,wind_speed_10m,wind_direction_10m,wind_gusts_10m",
-        "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,wind_speed_10m_max,wind_direction_10m_dominant",
-        "current": "temperature_2m,relative_humidity_2m,wind_speed_10m,wind_direction_10m,weather_code",
-        "timezone": "Europe/Amsterdam",
-        "forecast_days": 7
-    }
+"""
+
+# HTML-sjabloon voor de metric-kaarten
+_CARD_TMPL = """
+<div class="{card}">
+    <div class="metric-value">{value}</div>
+    <div class="metric-label">{label}</div>
+</div>
+"""
+
+st.set_page_config(
+    page_title="Venlo Weer",
+    page_icon="🌤️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+
+@st.cache_resource
+def http_session() -> requests.Session:
+    """Gedeelde HTTP-sessie: hergebruikt de TCP/TLS-verbinding tussen reruns."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        # Alleen verbindingsfouten en 5xx herhalen; een read-timeout herhalen maakt het trage pad alleen trager
+        max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    ))
+    session.headers["User-Agent"] = "venlo-weer/1.0"
+    return session
+
+
+class SourceUnavailable(requests.ConnectionError):
+    """Bron bleek kort geleden onbereikbaar en wordt tijdelijk overgeslagen."""
+
+
+@st.cache_resource
+def outages() -> dict[str, float]:
+    """Per bron het tijdstip (time.monotonic) tot wanneer deze als onbereikbaar geldt; gedeeld over sessies."""
+    return {}
+
+
+def guarded_get(source: str, url: str) -> requests.Response:
+    """GET via de gedeelde sessie; na een verbindingsfout of timeout wordt de bron OUTAGE_TTL s overgeslagen.
+
+    Zo kost een storing hooguit één timeout per OUTAGE_TTL in plaats van één per fetch en per rerun.
+    """
+    remaining = outages().get(source, 0.0) - time.monotonic()
+    if remaining > 0:
+        raise SourceUnavailable(f"{source} niet bereikbaar; nieuwe poging over {remaining:.0f} s")
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        st.error(f"Fout bij ophalen weerdata: {e}")
-        return None
+        response = http_session().get(url, timeout=HTTP_TIMEOUT)
+    except (requests.ConnectionError, requests.Timeout):
+        outages()[source] = time.monotonic() + OUTAGE_TTL
+        raise
+    response.raise_for_status()
+    return response
+
+
+def fetch_forecast(lat: float, lon: float, query: str) -> dict:
+    """Haal (een deel van) de weerdata op van de Open-Meteo API; fouten worden doorgegeven."""
+    url = f"{FORECAST_URL}?latitude={lat}&longitude={lon}&{query}"
+    return orjson.loads(guarded_get("Open-Meteo", url).content)
+
+
+@st.cache_data(ttl=60, show_spinner=False, max_entries=8)  # Cache 1 minuut
+def fetch_current(lat: float, lon: float) -> dict:
+    """Haal het huidige weer op."""
+    return fetch_forecast(lat, lon, CURRENT_QUERY)
+
+
+@st.cache_data(ttl=600, show_spinner=False, max_entries=8)  # Cache 10 minuten
+def fetch_hourly(lat: float, lon: float) -> dict:
+    """Haal de uurlijkse verwachting op."""
+    return fetch_forecast(lat, lon, HOURLY_QUERY)
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=8)  # Cache 1 uur
+def fetch_daily(lat: float, lon: float) -> dict:
+    """Haal de dagelijkse verwachting op."""
+    return fetch_forecast(lat, lon, DAILY_QUERY)
+
+
+def load_forecasts(*fetches: Callable[[float, float], dict]) -> list[dict]:
+    """Roep de gecachte fetch-functies aan; toon fouten en geef {} terug voor wat mislukt.
+
+    Fouten worden buiten de cache afgehandeld, zodat een mislukte aanroep niet wordt gecachet.
+    Een overgeslagen bron (SourceUnavailable) wordt maar één keer gemeld.
+    """
+    results = []
+    error_shown = False
+    for fetch in fetches:
+        try:
+            results.append(fetch(VENLO_LAT, VENLO_LON))
+        except SourceUnavailable as e:
+            if not error_shown:
+                st.error(f"Fout bij ophalen weerdata: {e}")
+                error_shown = True
+            results.append({})
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            st.error(f"Fout bij ophalen weerdata: {e}")
+            error_shown = True
+            results.append({})
+    return results
+
+
+@st.cache_data(ttl=300)  # Cache 5 minuten
+def fetch_radar_image() -> bytes:
+    """Haal de actuele radar-afbeelding op van Buienradar (fouten worden niet gecachet)."""
+    response = guarded_get("Buienradar", RADAR_URL)
+    content_type = response.headers.get("Content-Type", "")
+    if not content_type.startswith("image/"):
+        raise requests.RequestException(f"Geen afbeelding ontvangen (Content-Type: {content_type or 'onbekend'})", response=response)
+    return response.content
 
 
 def get_weather_emoji(code: int) -> str:
     """Converteer WMO weer code naar emoji."""
-    codes = {
-        0: "☀️", 1: "🌤️", 2: "⛅", 3: "☁️", 45: "🌫️", 48: "🌫️",
-        51: "🌧️", 53: "🌧️", 55: "🌧️", 61: "🌧️", 63: "🌧️", 65: "🌧️",
-        66: "🌨️", 67: "🌨️", 71: "❄️", 73: "❄️", 75: "❄️",
-        77: "❄️", 80: "🌦️", 81: "🌦️", 82: "🌦️", 85: "🌨️", 86: "🌨️",
-        95: "⛈️", 96: "⛈️", 99: "⛈️"
-    }
-    return codes.get(code, "🌡️")
+    return _WMO_EMOJI.get(code, "🌡️")
 
 
 def direction_to_text(degrees: int) -> str:
     """Converteer windrichting in graden naar tekst."""
-    directions = ["N", "NNO", "NO", "ONO", "O", "OZO", "ZO", "ZZO", "Z", "ZZW", "ZW", "WZW", "W", "WNW", "NW", "NNW"]
-    idx = round(degrees / 22.5) % 16
-    return directions[idx]
+    return str(_DIRECTIONS[round(degrees / 22.5) % 16])
+
+
+def directions_to_text(degrees: list[float | None] | np.ndarray) -> np.ndarray:
+    """Converteer een reeks windrichtingen in graden naar tekst (gevectoriseerd); ontbrekend wordt "-"."""
+    arr = np.asarray(degrees, dtype=np.float64)
+    valid = np.isfinite(arr)
+    idx = np.rint(np.where(valid, arr, 0.0) / 22.5).astype(np.int64) % 16
+    return np.where(valid, _DIRECTIONS[idx], "-")
+
+
+@st.cache_resource
+def base_map_html() -> tuple[str, str]:
+    """Bouw de statische Folium-basiskaart van Venlo; geeft (html, JS-naam van de kaart)."""
+    import folium  # Lazy: alleen nodig bij de eerste opbouw
+
+    m = folium.Map(
+        location=[VENLO_LAT, VENLO_LON],
+        zoom_start=13,
+        tiles="OpenStreetMap"
+    )
+    return m.get_root().render(), m.get_name()
+
+
+@st.cache_data(ttl=600)
+def build_map_html(temp: float, wind_speed: float, wind_dir: float, humidity: float) -> str:
+    """Voeg marker met weerinfo en windpijl toe aan de basiskaart en geef de HTML terug."""
+    html, map_name = base_map_html()
+
+    # Popup met weerinfo
+    popup_html = f"""
+    <div style="font-family: Arial; min-width: 180px;">
+        <h4 style="margin: 0 0 10px 0;">🌤️ Venlo</h4>
+        <p style="margin: 5px 0;"><b>Temperatuur:</b> {temp:.1f}°C</p>
+        <p style="margin: 5px 0;"><b>Wind:</b> {wind_speed:.1f} km/h {direction_to_text(wind_dir)}</p>
+        <p style="margin: 5px 0;"><b>Luchtvochtigheid:</b> {humidity:.0f}%</p>
+    </div>
+    """
+
+    # Windrichting als pijl op de kaart (indicatief)
+    arrow_len = 0.02
+    idx = round(wind_dir / 22.5) % 16
+    end_lat = VENLO_LAT + arrow_len * _COS16[idx]
+    end_lon = VENLO_LON + arrow_len * _SIN16[idx]
+
+    overlay = f"""<script>
+    L.marker([{VENLO_LAT}, {VENLO_LON}], {{
+        icon: L.AwesomeMarkers.icon({{markerColor: "blue", iconColor: "white", icon: "cloud", prefix: "glyphicon"}})
+    }})
+        .bindPopup({orjson.dumps(popup_html).decode()}, {{maxWidth: 250}})
+        .bindTooltip("Venlo - klik voor weerinfo", {{sticky: true}})
+        .addTo({map_name});
+    L.polyline([[{VENLO_LAT}, {VENLO_LON}], [{end_lat}, {end_lon}]], {{color: "blue", weight: 3}})
+        .addTo({map_name});
+</script>
+"""
+    head, _, tail = html.rpartition("</html>")
+    return head + overlay + "</html>" + tail
+
+
+@st.cache_resource
+def coords_table() -> pd.DataFrame:
+    """Statische tabel met de coördinaten van Venlo (eenmaal per proces opgebouwd)."""
+    return pd.DataFrame({
+        "Eigenschap": ["Breedtegraad (Noord)", "Lengtegraad (Oost)", "Decimaal", "DMS"],
+        "Waarde": [
+            f"{VENLO_LAT}° N",
+            f"{VENLO_LON}° E",
+            f"{VENLO_LAT:.4f}, {VENLO_LON:.4f}",
+            "51°22'12\" N, 6°10'5\" E"
+        ]
+    })
+
+
+def slice_chars(arr: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Snijd een vast stuk uit elke string van een numpy string-array (gevectoriseerd)."""
+    width = arr.dtype.itemsize // 4
+    chars = arr.view("U1").reshape(-1, width)[:, start:stop]
+    return np.ascontiguousarray(chars).view(f"U{stop - start}").ravel()
 
 
 def main():
+    st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
     st.markdown('<p class="main-header">🌤️ Venlo Weer App</p>', unsafe_allow_html=True)
 
     # Vernieuwknop
     col_btn, _ = st.columns([1, 5])
     with col_btn:
         if st.button("🔄 Data vernieuwen", type="primary"):
-            fetch_weather_data.clear()
+            fetch_current.clear()
+            fetch_hourly.clear()
+            fetch_daily.clear()
+            fetch_radar_image.clear()
+            outages().clear()
             st.rerun()
 
     st.markdown("---")
 
     # Haal weerdata op
     with st.spinner("Weerdata ophalen..."):
-        data = fetch_weather_data(VENLO_LAT, VENLO_LON)
-
-    if not data:
-        return
+        current_data, hourly_data, daily_data = load_forecasts(fetch_current, fetch_hourly, fetch_daily)
 
     # Ondersteun zowel "current" als "current_weather" (oude API)
-    current = data.get("current") or data.get("current_weather", {})
+    current = current_data.get("current") or current_data.get("current_weather", {})
     if "windspeed" in current and "wind_speed_10m" not in current:
         current["wind_speed_10m"] = current["windspeed"]
         current["wind_direction_10m"] = current.get("winddirection", 0)
         current["temperature_2m"] = current.get("temperature", 0)
         current["weather_code"] = current.get("weathercode", 0)
         current["relative_humidity_2m"] = None
-    hourly = data.get("hourly", {})
-    daily = data.get("daily", {})
+    hourly = hourly_data.get("hourly", {})
+    daily = daily_data.get("daily", {})
 
     # --- Sidebar ---
     with st.sidebar:
@@ -144,57 +397,46 @@ def main():
         st.markdown("---")
         st.subheader("🌡️ Nu")
         weather_code = current.get("weather_code", 0)
-        st.markdown(f"**{get_weather_emoji(weather_code)}** Huidig weer")
+        if current:
+            st.markdown(f"**{get_weather_emoji(weather_code)}** Huidig weer")
 
     # --- Huidig weer ---
     st.subheader("📍 Huidig weer in Venlo")
 
-    col1, col2, col3, col4, col5 = st.columns(5)
-
     temp = current.get("temperature_2m", 0)
     humidity = current.get("relative_humidity_2m") or 0
     wind_speed = current.get("wind_speed_10m", 0)
     wind_dir = current.get("wind_direction_10m", 0)
 
-    with col1:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{temp:.1f}°C</div>
-            <div class="metric-label">Temperatuur</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{humidity:.0f}%</div>
-            <div class="metric-label">Luchtvochtigheid</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="wind-card">
-            <div class="metric-value">{wind_speed:.1f} km/h</div>
-            <div class="metric-label">Windsnelheid</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col4:
-        st.markdown(f"""
-        <div class="wind-card">
-            <div class="metric-value">{direction_to_text(wind_dir)}</div>
-            <div class="metric-label">Windrichting ({wind_dir}°)</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col5:
-        st.markdown(f"""
-        <div class="metric-card">
-            <div class="metric-value">{get_weather_emoji(weather_code)}</div>
-            <div class="metric-label">Weertype</div>
-        </div>
-        """, unsafe_allow_html=True)
+    if current:
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            st.markdown(_CARD_TMPL.format(
+                card="metric-card", value=f"{temp:.1f}°C", label="Temperatuur"
+            ), unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(_CARD_TMPL.format(
+                card="metric-card", value=f"{humidity:.0f}%", label="Luchtvochtigheid"
+            ), unsafe_allow_html=True)
+
+        with col3:
+            st.markdown(_CARD_TMPL.format(
+                card="wind-card", value=f"{wind_speed:.1f} km/h", label="Windsnelheid"
+            ), unsafe_allow_html=True)
+
+        with col4:
+            st.markdown(_CARD_TMPL.format(
+                card="wind-card", value=direction_to_text(wind_dir), label=f"Windrichting ({wind_dir}°)"
+            ), unsafe_allow_html=True)
+
+        with col5:
+            st.markdown(_CARD_TMPL.format(
+                card="metric-card", value=get_weather_emoji(weather_code), label="Weertype"
+            ), unsafe_allow_html=True)
+    else:
+        st.info("Huidig weer niet beschikbaar")
 
     st.markdown("---")
 
@@ -203,168 +445,119 @@ def main():
 
     with tab1:
         st.subheader("📈 5-daagse voorspelling")
-        daily_times = daily.get("time", [])[:5]
-        daily_max = daily.get("temperature_2m_max", [])[:5]
-        daily_min = daily.get("temperature_2m_min", [])[:5]
-        daily_precip = daily.get("precipitation_sum", [])[:5]
-        df_5d = pd.DataFrame({
-            "Dag": [datetime.strptime(d, "%Y-%m-%d").strftime("%a %d %b") for d in daily_times],
-            "Max (°C)": daily_max,
-            "Min (°C)": daily_min,
-            "Neerslag (mm)": daily_precip
-        })
-        orange = "#ff8c00"
-        df_5d_melt = df_5d.melt(id_vars=["Dag"], value_vars=["Max (°C)", "Min (°C)"], var_name="Type", value_name="°C")
-        chart_5d = alt.Chart(df_5d_melt).mark_line(point=True).encode(
-            x=alt.X("Dag:N", title="Dag", sort=None),
-            y=alt.Y("°C:Q", title="Temperatuur (°C)"),
-            color=alt.Color("Type:N", scale=alt.Scale(range=[orange, "#ffa500"])),
-            strokeWidth=alt.value(3)
-        ).properties(height=300)
-        st.altair_chart(chart_5d, use_container_width=True)
-        if daily_precip and any(p and p > 0 for p in daily_precip):
-            st.subheader("Neerslag 5 dagen")
-            st.altair_chart(alt.Chart(df_5d).mark_bar(color=orange).encode(
-                x=alt.X("Dag:N", title="Dag", sort=None),
-                y=alt.Y("Neerslag (mm):Q", title="Neerslag (mm)")
-            ).properties(height=200), use_container_width=True)
+        if daily:
+            daily_times = daily.get("time", [])[:5]
+            daily_max = daily.get("temperature_2m_max", [])[:5]
+            daily_min = daily.get("temperature_2m_min", [])[:5]
+            daily_precip = daily.get("precipitation_sum", [])[:5]
+            df_5d = pd.DataFrame({
+                "Dag": [datetime.strptime(d, "%Y-%m-%d").strftime("%a %d %b") for d in daily_times],
+                "Max (°C)": daily_max,
+                "Min (°C)": daily_min,
+                "Neerslag (mm)": daily_precip
+            })
+            st.vega_lite_chart(df_5d, _FORECAST_TEMP_SPEC, use_container_width=True)
+            if daily_precip and any(p and p > 0 for p in daily_precip):
+                st.subheader("Neerslag 5 dagen")
+                st.vega_lite_chart(df_5d, _FORECAST_PRECIP_SPEC, use_container_width=True)
+        else:
+            st.info("Dagelijkse verwachting niet beschikbaar")
 
     with tab2:
         st.subheader("Uurlijkse verwachting (48 uur)")
-        times = hourly.get("time", [])[:48]
-        temps = hourly.get("temperature_2m", [])[:48]
-        wind_speeds = hourly.get("wind_speed_10m", [])[:48]
-        wind_dirs = hourly.get("wind_direction_10m", [])[:48]
-        precip_probs = hourly.get("precipitation_probability", [None] * 48)[:48]
-
-        df_hourly = pd.DataFrame({
-            "Tijd": [t[11:16] if len(t) > 10 else t for t in times],
-            "Datum": [t[:10] for t in times],
-            "Temp (°C)": temps,
-            "Wind (km/h)": wind_speeds,
-            "Windrichting": [direction_to_text(d) for d in wind_dirs],
-            "Neerslag %": precip_probs
-        })
-
-        st.dataframe(df_hourly, use_container_width=True, hide_index=True)
-
-        # Lijn grafieken (oranje)
-        chart_df = pd.DataFrame({
-            "Tijd": [t[11:16] if len(t) > 10 else t for t in times],
-            "Temperatuur (°C)": temps,
-            "Windsnelheid (km/h)": wind_speeds
-        })
-        orange = "#ff8c00"
-        chart_temp = alt.Chart(chart_df).mark_line(color=orange).encode(
-            x=alt.X("Tijd:N", title="Tijd"),
-            y=alt.Y("Temperatuur (°C):Q", title="Temperatuur (°C)")
-        ).properties(height=180)
-        chart_wind = alt.Chart(chart_df).mark_line(color=orange).encode(
-            x=alt.X("Tijd:N", title="Tijd"),
-            y=alt.Y("Windsnelheid (km/h):Q", title="Windsnelheid (km/h)")
-        ).properties(height=180)
-        st.altair_chart(alt.vconcat(chart_temp, chart_wind), use_container_width=True)
+        if hourly:
+            times = hourly.get("time", [])
+            n = min(48, len(times))
+            t_arr = np.asarray(times[:n], dtype="U16")
+            temps_arr = np.asarray(hourly.get("temperature_2m", [])[:n], dtype=np.float64)
+            wind_speeds_arr = np.asarray(hourly.get("wind_speed_10m", [])[:n], dtype=np.float64)
+            wind_dirs_arr = np.asarray(hourly.get("wind_direction_10m", [])[:n], dtype=np.float64)
+            precip_arr = np.asarray(hourly.get("precipitation_probability", [None] * n)[:n], dtype=np.float64)
+
+            df_hourly = pd.DataFrame({
+                "Tijd": slice_chars(t_arr, 11, 16),
+                "Datum": slice_chars(t_arr, 0, 10),
+                "Temp (°C)": temps_arr,
+                "Wind (km/h)": wind_speeds_arr,
+                "Windrichting": directions_to_text(wind_dirs_arr),
+                "Neerslag %": precip_arr
+            }, copy=False)
+
+            # Tabel per 3 uur (de grafieken tonen de volledige resolutie)
+            with st.expander("📋 Uurlijkse tabel (per 3 uur)", expanded=False):
+                st.dataframe(df_hourly.iloc[::3], use_container_width=True, hide_index=True)
+
+            # Lijn grafieken (oranje)
+            st.vega_lite_chart(df_hourly, _HOURLY_TEMP_SPEC, use_container_width=True)
+            st.vega_lite_chart(df_hourly, _HOURLY_WIND_SPEC, use_container_width=True)
+        else:
+            st.info("Uurlijkse verwachting niet beschikbaar")
 
     with tab3:
         st.subheader("7-dagen verwachting")
-        daily_times = daily.get("time", [])
-        daily_max = daily.get("temperature_2m_max", [])
-        daily_min = daily.get("temperature_2m_min", [])
-        daily_precip = daily.get("precipitation_sum", [])
-        daily_wind_max = daily.get("wind_speed_10m_max", [])
-        daily_wind_dir = daily.get("wind_direction_10m_dominant", [])
-
-        df_daily = pd.DataFrame({
-            "Datum": daily_times,
-            "Max (°C)": daily_max,
-            "Min (°C)": daily_min,
-            "Neerslag (mm)": daily_precip,
-            "Max wind (km/h)": daily_wind_max,
-            "Windrichting": [direction_to_text(d) for d in daily_wind_dir]
-        })
-
-        st.dataframe(df_daily, use_container_width=True, hide_index=True)
-
-        orange = "#ff8c00"
-        col_a, col_b = st.columns(2)
-        with col_a:
-            df_temp = df_daily.melt(id_vars=["Datum"], value_vars=["Max (°C)", "Min (°C)"], var_name="Type", value_name="°C")
-            bar_temp = alt.Chart(df_temp).mark_bar().encode(
-                x=alt.X("Datum:N", title="Datum"),
-                y=alt.Y("°C:Q", title="Temperatuur (°C)", stack=None),
-                color=alt.Color("Type:N", scale=alt.Scale(range=[orange, "#ffa500"]))
-            ).properties(height=250)
-            st.altair_chart(bar_temp, use_container_width=True)
-        with col_b:
-            if daily_wind_max:
-                st.altair_chart(alt.Chart(df_daily).mark_bar(color=orange).encode(
-                    x=alt.X("Datum:N", title="Datum"),
-                    y=alt.Y("Max wind (km/h):Q", title="Max wind (km/h)")
-                ).properties(height=250), use_container_width=True)
-            else:
-                st.info("Windgegevens niet beschikbaar voor dagelijkse data")
+        if daily:
+            daily_times = daily.get("time", [])
+            daily_max = daily.get("temperature_2m_max", [])
+            daily_min = daily.get("temperature_2m_min", [])
+            daily_precip = daily.get("precipitation_sum", [])
+            daily_wind_max = daily.get("wind_speed_10m_max", [])
+            daily_wind_dir = daily.get("wind_direction_10m_dominant", [])
+
+            df_daily = pd.DataFrame({
+                "Datum": np.asarray(daily_times, dtype="U10"),
+                "Max (°C)": np.asarray(daily_max, dtype=np.float64),
+                "Min (°C)": np.asarray(daily_min, dtype=np.float64),
+                "Neerslag (mm)": np.asarray(daily_precip, dtype=np.float64),
+                "Max wind (km/h)": np.asarray(daily_wind_max, dtype=np.float64),
+                "Windrichting": directions_to_text(daily_wind_dir)
+            }, copy=False)
+
+            st.dataframe(df_daily, use_container_width=True, hide_index=True)
+
+            col_a, col_b = st.columns(2)
+            with col_a:
+                st.vega_lite_chart(df_daily, _DAILY_TEMP_SPEC, use_container_width=True)
+            with col_b:
+                if daily_wind_max:
+                    st.vega_lite_chart(df_daily, _DAILY_WIND_SPEC, use_container_width=True)
+                else:
+                    st.info("Windgegevens niet beschikbaar voor dagelijkse data")
+        else:
+            st.info("Dagelijkse verwachting niet beschikbaar")
 
     with tab4:
         st.subheader("Interactieve kaart - Venlo")
-        m = folium.Map(
-            location=[VENLO_LAT, VENLO_LON],
-            zoom_start=13,
-            tiles="OpenStreetMap"
-        )
-
-        # Popup met weerinfo
-        popup_html = f"""
-        <div style="font-family: Arial; min-width: 180px;">
-            <h4 style="margin: 0 0 10px 0;">🌤️ Venlo</h4>
-            <p style="margin: 5px 0;"><b>Temperatuur:</b> {temp:.1f}°C</p>
-            <p style="margin: 5px 0;"><b>Wind:</b> {wind_speed:.1f} km/h {direction_to_text(wind_dir)}</p>
-            <p style="margin: 5px 0;"><b>Luchtvochtigheid:</b> {humidity:.0f}%</p>
-        </div>
-        """
-        folium.Marker(
-            [VENLO_LAT, VENLO_LON],
-            popup=folium.Popup(popup_html, max_width=250),
-            tooltip="Venlo - klik voor weerinfo",
-            icon=folium.Icon(color="blue", icon="cloud")
-        ).add_to(m)
-
-        # Windrichting als pijl op de kaart (indicatief)
-        arrow_len = 0.02
-        rad = math.radians(270 - wind_dir)  # North = 0
-        end_lat = VENLO_LAT + arrow_len * math.cos(rad)
-        end_lon = VENLO_LON + arrow_len * math.sin(rad)
-        folium.PolyLine(
-            [[VENLO_LAT, VENLO_LON], [end_lat, end_lon]],
-            color="blue",
-            weight=3
-        ).add_to(m)
-
-        st_folium(m, use_container_width=True, returned_objects=[])
+        if current:
+            map_html = build_map_html(round(temp, 1), round(wind_speed, 1), round(wind_dir, 1), round(humidity, 1))
+        else:
+            map_html = base_map_html()[0]
+        components.html(map_html, height=500)
 
         # Tabel met exacte coördinaten
         st.subheader("📍 Coördinaten Venlo")
-        df_coords = pd.DataFrame({
-            "Eigenschap": ["Breedtegraad (Noord)", "Lengtegraad (Oost)", "Decimaal", "DMS"],
-            "Waarde": [
-                f"{VENLO_LAT}° N",
-                f"{VENLO_LON}° E",
-                f"{VENLO_LAT:.4f}, {VENLO_LON:.4f}",
-                "51°22'12\" N, 6°10'5\" E"
-            ]
-        })
-        st.dataframe(df_coords, use_container_width=True, hide_index=True)
+        st.dataframe(coords_table(), use_container_width=True, hide_index=True)
 
     with tab5:
         st.subheader("🌧️ Neerslagradar (Nederland)")
         st.caption("Bron: Buienradar (radar overzicht Nederland/België)")
-        st.image(
-            RADAR_URL,
-            caption="Actuele radar (Buienradar)",
-            use_column_width=True,
-        )
+        try:
+            st.image(
+                fetch_radar_image(),
+                caption="Actuele radar (Buienradar)",
+                use_column_width=True,
+            )
+        except requests.RequestException as e:
+            st.error(f"Fout bij ophalen radarbeeld: {e}")
+        except OSError as e:
+            # Onleesbare afbeelding (bijv. afgebroken download): niet in de cache laten staan
+            fetch_radar_image.clear()
+            st.error(f"Radarbeeld kon niet worden weergegeven: {e}")
 
     st.markdown("---")
-    st.caption("Data via [Open-Meteo.com](https://open-meteo.com/) • Laatste update: " + datetime.now().strftime("%d-%m-%Y %H:%M"))
+    # Tijdstip van de meting uit de API (i.p.v. de klok), zodat de footer alleen bij nieuwe data verandert
+    data_time = current.get("time")
+    updated = datetime.fromisoformat(data_time) if data_time else datetime.now()
+    st.caption("Data via [Open-Meteo.com](https://open-meteo.com/) • Laatste update: " + updated.strftime("%d-%m-%Y %H:%M"))
 
 
 if __name__ == "__main__":